@@ -49,3 +49,50 @@ def test_signal_contract(ctx, state):
 
     print(state.copy())
     assert state == {"x": 5}
+
+
+def test_cached_fn(ctx, state):
+    @zproc.atomic
+    def increment(snap):
+        snap["x"] = snap.get("x", 0) + 1
+        return snap["x"]
+
+    assert increment(state) == 1
+    # the server already has the function by now
+    assert increment(state) == 2
+    assert increment(ctx.create_state()) == 3
+
+
+def test_unpicklable_state_contract(ctx, state):
+    state["a"] = 1
+
+    @zproc.atomic
+    def mutator(snap):
+        import threading
+
+        snap["lock"] = threading.Lock()
+
+    with pytest.raises(TypeError):
+        mutator(state)
+
+    assert state.copy() == {"a": 1}
+    assert state == {"a": 1}
+
+
+def test_evicted_fn(monkeypatch):
+    # the server process is forked after this, and inherits the smaller cache.
+    monkeypatch.setattr("zproc.state.server.FN_CACHE_SIZE", 1)
+    state = zproc.Context().create_state()
+
+    @zproc.atomic
+    def inc(snap):
+        snap["x"] = snap.get("x", 0) + 1
+
+    @zproc.atomic
+    def dec(snap):
+        snap["x"] -= 1
+
+    inc(state)
+    dec(state)
+    inc(state)
+    assert state["x"] == 1
@@ -0,0 +1,67 @@
+"""
+Test the State.batch() API
+"""
+import pytest
+
+import zproc
+
+
+@pytest.fixture
+def ctx():
+    return zproc.Context()
+
+
+@pytest.fixture
+def state(ctx) -> zproc.State:
+    return ctx.create_state({"foo": "foo"})
+
+
+def test_batch(state):
+    with state.batch():
+        state["bar"] = "bar"
+        state.update({"zoo": 1})
+        del state["foo"]
+
+        assert state == {"foo": "foo"}
+
+    assert state == {"bar": "bar", "zoo": 1}
+
+
+def test_batch_exception(state):
+    with pytest.raises(ValueError):
+        with state.batch():
+            state["bar"] = "bar"
+            raise ValueError
+
+    assert state == {"foo": "foo"}
+
+
+def test_batch_single_update(state):
+    # a State object never receives its own updates.
+    it = state.fork().when_change_raw(start_time=state.time(), timeout=1)
+
+    with state.batch():
+        state["bar"] = "bar"
+        state["zoo"] = 1
+
+    update = next(it)
+    assert update.before == {"foo": "foo"}
+    assert update.after == {"foo": "foo", "bar": "bar", "zoo": 1}
+
+
+def test_batch_snapshots_args(state):
+    value = {}
+    with state.batch():
+        state.update(value)
+        state["bar"] = value
+        value["x"] = 1
+
+    assert state == {"foo": "foo", "bar": {}}
+
+
+def test_batch_unpicklable_args(state):
+    with state.batch():
+        with pytest.raises(TypeError):
+            state.update((k, k) for k in "ab")
+
+    assert state == {"foo": "foo"}
@@ -1,6 +1,8 @@
 """
 Test the dict API, offered by State
 """
+from collections import OrderedDict, defaultdict
+
 import pytest
 
 import zproc
@@ -116,3 +118,17 @@ def test_pop(state, pydict):
 def test_popitem(state, pydict):
     assert state.popitem() == pydict.popitem()
     assert state == pydict
+
+
+def test_dict_subclass(ctx):
+    state = ctx.create_state()
+
+    state.set(OrderedDict(a=1))
+    state["b"] = 2
+    del state["a"]
+    state["c"] = 3
+    assert state.copy() == OrderedDict([("b", 2), ("c", 3)])
+
+    state.set(defaultdict(int))
+    assert state["foo"] == 0
+    assert state.copy() == {"foo": 0}
@@ -120,3 +120,14 @@ def test_exit(ctx):
 
     with pytest.raises(zproc.ProcessWaitError):
         ctx.wait()
+
+
+def test_start_all(ctx):
+    p1 = ctx.spawn(lambda: 1, start=False)
+    p2 = ctx.spawn(lambda: 2, start=False)
+    p3 = ctx.spawn(lambda: 3, start=False)
+
+    p1.start()
+    ctx.start_all()
+
+    assert ctx.wait(1) == [1, 2, 3]
@@ -41,3 +41,8 @@ def test_infinite_retry(ctx, state):
         p.wait(timeout=0.1)
     p.stop()
     assert 10 <= state["times"] <= 20
+
+
+def test_invalid_retry_for(ctx):
+    with pytest.raises(ValueError):
+        ctx.spawn(lambda ctx: None, retry_for=[1])
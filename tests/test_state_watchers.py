@@ -31,6 +31,16 @@ def test_when_change(state):
     assert isinstance(next(it), dict)
 
 
+def test_when_change_keys(state):
+    it = state.when_change("avail")
+    assert next(it)["avail"] is True
+
+
+def test_when_change_exclude(state):
+    it = state.when_change("none", "flag", exclude=True)
+    assert next(it)["avail"] is True
+
+
 ###
 
 
@@ -77,3 +87,47 @@ def test_when_not_none(state):
 def test_when_avail(state):
     it = state.when_available("avail")
     assert "avail" in next(it)
+
+
+###
+
+
+def test_when_change_set():
+    ctx = zproc.Context()
+    state = ctx.create_state()
+
+    it = state.fork().when_change(timeout=1)
+    state.set({"foo": 1})
+    assert next(it) == {"foo": 1}
+
+
+def test_when_change_raw_ignores_reads():
+    ctx = zproc.Context()
+    state = ctx.create_state({"foo": 1})
+
+    it = state.fork().when_change_raw(identical_okay=True, timeout=0.5)
+    assert state["foo"] == 1
+    assert "foo" in state
+    with pytest.raises(TimeoutError):
+        next(it)
+
+
+def test_when_change_raw_skips_identical_setitem():
+    ctx = zproc.Context()
+    state = ctx.create_state({"foo": 1})
+
+    it = state.fork().when_change_raw(timeout=1)
+    state["foo"] = 1.0
+    state["bar"] = 2
+    update = next(it)
+    assert update.after == {"foo": 1.0, "bar": 2}
+    assert not update.is_identical
+
+
+def test_when_change_timeout_after_close():
+    ctx = zproc.Context()
+    state = ctx.create_state()
+    ctx.server_process.terminate()
+
+    with pytest.raises(TimeoutError):
+        next(state.when_change(timeout=0.5))
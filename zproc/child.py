@@ -21,7 +21,9 @@ class ChildProcess:
         self.retry_delay = self.kwargs["retry_delay"]
         self.retry_args = self.kwargs["retry_args"]
         self.retry_kwargs = self.kwargs["retry_kwargs"]
-        self.to_catch = tuple(util.to_catchable_exc(self.kwargs["retry_for"]))
+        self.to_catch = self.kwargs["to_catch"]
+        for sig in self.kwargs["retry_signals"]:
+            exceptions.signal_to_exception(sig)
         self.target = self.kwargs["target"]
 
         self.target_args = self.kwargs["target_args"]
@@ -22,6 +22,7 @@ class Msgs:
     namespace = 2
     args = 3
     kwargs = 4
+    fn = 5
 
 
 class Cmds:
@@ -37,6 +38,10 @@ class Cmds:
     time = 6
 
 
+class FnNotCached:
+    """Replied by the server, when it doesn't have the function a client asked it to run."""
+
+
 class ServerMeta(NamedTuple):
     version: str
 
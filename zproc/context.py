@@ -1,7 +1,6 @@
 import atexit
 import multiprocessing
 import pprint
-import signal
 import time
 from contextlib import suppress
 from typing import Callable, Union, Any, List, Mapping, Sequence, Tuple, cast
@@ -15,6 +14,15 @@ from .task.map_plus import map_plus
 from .task.swarm import Swarm
 
 
+# Contexts created with ``wait=True``, waited upon by a single ``atexit`` callback.
+_wait_at_exit = []  # type: List[Context]
+
+
+def _wait_all_at_exit():
+    for ctx in _wait_at_exit:
+        ctx.wait()
+
+
 class ProcessList(list):
     def __str__(self):
         return ProcessList.__qualname__ + ": " + pprint.pformat(list(self))
@@ -67,8 +75,8 @@ class ProcessList(list):
         Ignores if a Process is already started, unlike :py:meth:`~Process.start()`,
         which throws an ``AssertionError``.
         """
-        with suppress(AssertionError):
-            for process in self:
+        for process in self:
+            with suppress(AssertionError):
                 process.start()
 
     def stop(self):
@@ -182,11 +190,11 @@ class Context:
         # register cleanup before wait, so that wait runs before cleanup.
         # (order of execution is reversed)
         if cleanup:
-            atexit.register(util.clean_process_tree)
-            if util.is_main_thread():
-                signal.signal(signal.SIGTERM, util.clean_process_tree)
+            util.register_process_tree_cleanup()
         if wait:
-            atexit.register(self.wait)
+            if not _wait_at_exit:
+                atexit.register(_wait_all_at_exit)
+            _wait_at_exit.append(self)
 
     def __str__(self):
         return "%s - server: %r at %#x" % (
@@ -160,7 +160,9 @@ class Process:
         if kwargs is None:
             kwargs = {}
 
-        self._zmq_ctx = util.create_zmq_ctx()
+        to_catch, retry_signals = util.split_retry_for(retry_for)
+
+        self._zmq_ctx = util.get_shared_zmq_ctx()
 
         self._result_sock = self._zmq_ctx.socket(zmq.PAIR)
         # The result socket is meant to be used only after the process completes (after `join()`).
@@ -177,7 +179,8 @@ class Process:
                 pass_context=pass_context,
                 target_args=args,
                 target_kwargs=kwargs,
-                retry_for=retry_for,
+                to_catch=to_catch,
+                retry_signals=retry_signals,
                 retry_delay=retry_delay,
                 max_retries=max_retries,
                 retry_args=retry_args,
@@ -227,7 +230,6 @@ class Process:
 
     def _cleanup(self):
         self._result_sock.close()
-        util.close_zmq_ctx(self._zmq_ctx)
 
     def stop(self):
         """
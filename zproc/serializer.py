@@ -1,4 +1,5 @@
 import pickle
+from functools import lru_cache
 from typing import Callable, Any, Dict
 
 from cloudpickle import cloudpickle
@@ -6,8 +7,11 @@ from cloudpickle import cloudpickle
 from zproc import exceptions
 
 
+_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+
 def dumps(obj: Any) -> bytes:
-    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    return pickle.dumps(obj, _PROTOCOL)
 
 
 def loads(bytes_obj: bytes) -> Any:
@@ -37,14 +41,7 @@ def dumps_fn(fn: Callable) -> bytes:
     return fn_bytes
 
 
-_fn_load_cache: Dict[int, Callable] = {}
-
-
+# keyed by the bytes themselves, so that a hash collision can't return the wrong function.
+@lru_cache(maxsize=1024)
 def loads_fn(fn_bytes: bytes) -> Callable:
-    fn_bytes_hash = hash(fn_bytes)
-    try:
-        fn = _fn_load_cache[fn_bytes_hash]
-    except KeyError:
-        fn = cloudpickle.loads(fn_bytes)
-        _fn_load_cache[fn_bytes_hash] = fn
-    return fn
+    return cloudpickle.loads(fn_bytes)
@@ -18,6 +18,10 @@ def main(server_address: str, send_conn):
     ):
         atexit.register(util.clean_process_tree)
 
+        # Replies to clients that have gone away shouldn't keep the server from exiting.
+        for sock in state_router, watch_router:
+            sock.setsockopt(zmq.LINGER, 0)
+
         try:
             if server_address:
                 state_router.bind(server_address)
@@ -46,9 +50,10 @@ def main(server_address: str, send_conn):
             with send_conn:
                 send_conn.send_bytes(serializer.dumps(server_meta))
 
+        tick, reset = state_server.tick, state_server.reset_internal_state
         while True:
             try:
-                state_server.tick()
+                tick()
             except KeyboardInterrupt:
                 util.log_internal_crash("State Server")
                 return
@@ -58,4 +63,4 @@ def main(server_address: str, send_conn):
                 else:
                     state_server.reply(RemoteException())
             finally:
-                state_server.reset_internal_state()
+                reset()
@@ -1,6 +1,8 @@
+from zproc import serializer
 from zproc.consts import Msgs, Cmds
 
-STATE_DICT_METHODS = {
+# Sent over the wire by their index in this tuple, rather than by name.
+STATE_DICT_METHODS = (
     "__contains__",
     "__delitem__",
     "__eq__",
@@ -15,10 +17,24 @@ STATE_DICT_METHODS = {
     "popitem",
     "setdefault",
     "update",
+)
+
+# These don't return anything useful, and hence can be queued up by ``State.batch()``.
+STATE_DICT_WRITE_ONLY_METHODS = {"__delitem__", "__setitem__", "clear", "update"}
+
+# These never modify the state, and hence don't need to be run safely on the server.
+STATE_DICT_READ_ONLY_METHODS = {
+    "__contains__",
+    "__eq__",
+    "__getitem__",
+    "__iter__",
+    "__len__",
+    "__ne__",
+    "get",
 }
 
 
-def _create_remote_dict_method(dict_method_name: str):
+def _create_remote_dict_method(dict_method_name: str, dict_method_index: int):
     """
     Generates a method for the State class,
     that will call the "method_name" on the state (a ``dict``) stored on the server,
@@ -28,10 +44,14 @@ def _create_remote_dict_method(dict_method_name: str):
     """
 
     def remote_method(self, *args, **kwargs):
+        if self._batch is not None and dict_method_name in STATE_DICT_WRITE_ONLY_METHODS:
+            # serialize right away, so that later changes to the arguments don't leak in.
+            self._batch.append(serializer.dumps((dict_method_name, args, kwargs)))
+            return
         return self._s_request_reply(
             {
                 Msgs.cmd: Cmds.run_dict_method,
-                Msgs.info: dict_method_name,
+                Msgs.info: dict_method_index,
                 Msgs.args: args,
                 Msgs.kwargs: kwargs,
             }
@@ -45,8 +65,8 @@ class StateType(type):
     def __new__(mcs, *args, **kwargs):
         cls = super().__new__(mcs, *args, **kwargs)
 
-        for name in STATE_DICT_METHODS:
-            setattr(cls, name, _create_remote_dict_method(name))
+        for index, name in enumerate(STATE_DICT_METHODS):
+            setattr(cls, name, _create_remote_dict_method(name, index))
 
         return cls
 
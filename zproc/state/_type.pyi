@@ -1,9 +1,13 @@
-from typing import TypeVar, Iterator, overload, Optional, Mapping, Union, Tuple
+from typing import TypeVar, Iterator, overload, Optional, Mapping, Union, Tuple, Set
 
 T = TypeVar("T")
 KT = TypeVar("KT")
 VT = TypeVar("VT")
 
+STATE_DICT_METHODS: Tuple[str, ...]
+STATE_DICT_WRITE_ONLY_METHODS: Set[str]
+STATE_DICT_READ_ONLY_METHODS: Set[str]
+
 class StateType(type):
     pass
 
@@ -2,19 +2,32 @@ import os
 import struct
 import time
 from bisect import bisect
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 from contextlib import contextmanager
-from copy import deepcopy
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, List, Tuple
 
 import zmq
 
 from zproc import serializer
-from zproc.consts import Cmds, ServerMeta
+from zproc.consts import Cmds, ServerMeta, FnNotCached
 from zproc.consts import Msgs
+from zproc.state._type import STATE_DICT_METHODS, STATE_DICT_READ_ONLY_METHODS
 
 RequestType = Dict[Msgs, Any]
 
+_MISSING = object()
+
+# Same bound as ``serializer.loads_fn()``.
+# An evicted function is simply asked for again, using ``FnNotCached``.
+FN_CACHE_SIZE = 1024
+
+SETITEM = STATE_DICT_METHODS.index("__setitem__")
+READ_ONLY_DICT_METHODS = {
+    index
+    for index, name in enumerate(STATE_DICT_METHODS)
+    if name in STATE_DICT_READ_ONLY_METHODS
+}
+
 
 class StateServer:
     identity: bytes
@@ -22,9 +35,12 @@ class StateServer:
 
     state_map: Dict[bytes, dict]
     state: dict
+    # the latest pickle of each namespace's state, kept up-to-date by mutate_safely()
+    pickled_state_map: Dict[bytes, bytes]
 
-    history: Dict[bytes, Tuple[List[float], List[List[bytes]]]]
+    history: Dict[bytes, Tuple[List[float], List[list]]]
     pending: Dict[bytes, Tuple[bytes, bytes, bool, float]]
+    fn_cache: "OrderedDict[bytes, Callable]"
 
     def __init__(
         self,
@@ -36,6 +52,12 @@ class StateServer:
         self.watch_router = watch_router
         self.server_meta = server_meta
 
+        # registered once, instead of building a poll list on every tick.
+        self.poller = zmq.Poller()
+        self.poller.register(watch_router, zmq.POLLIN)
+        self.poller.register(state_router, zmq.POLLIN)
+        self._send = state_router.send
+
         self.dispatch_dict = {
             Cmds.run_fn_atomically: self.run_fn_atomically,
             Cmds.run_dict_method: self.run_dict_method,
@@ -46,13 +68,24 @@ class StateServer:
             Cmds.time: self.time,
         }
         self.state_map = defaultdict(dict)
+        self.pickled_state_map = {}
 
         self.history = defaultdict(lambda: ([], []))
         self.pending = {}
+        self.fn_cache = OrderedDict()
+
+    def pickled_state(self) -> bytes:
+        try:
+            return self.pickled_state_map[self.namespace]
+        except KeyError:
+            state_bytes = self.pickled_state_map[self.namespace] = serializer.dumps(
+                self.state
+            )
+            return state_bytes
 
     def send_state(self, _):
         """reply with state to the current client"""
-        self.reply(self.state)
+        self.reply_bytes(self.pickled_state())
 
     def get_server_meta(self, _):
         self.reply(self.server_meta)
@@ -66,29 +99,63 @@ class StateServer:
     def set_state(self, request):
         new = request[Msgs.info]
         with self.mutate_safely():
-            self.state_map[self.namespace] = new
-            self.reply(True)
+            self.state = self.state_map[self.namespace] = new
+        self.reply(True)
 
     def run_dict_method(self, request):
         """Execute a method on the state ``dict`` and reply with the result."""
-        state_method_name, args, kwargs = (
+        state_method_index, args, kwargs = (
             request[Msgs.info],
             request[Msgs.args],
             request[Msgs.kwargs],
         )
         # print(method_name, args, kwargs)
-        with self.mutate_safely():
-            self.reply(getattr(self.state, state_method_name)(*args, **kwargs))
+        # looked up on the instance, since State.set() may store a dict subclass.
+        method = getattr(self.state, STATE_DICT_METHODS[state_method_index])
+        # A subclass may change itself even on reads (e.g. ``defaultdict.__getitem__``).
+        if state_method_index in READ_ONLY_DICT_METHODS and type(self.state) is dict:
+            # nothing to roll back, and nothing to record in history.
+            self.reply(method(*args, **kwargs))
+            return
+        if state_method_index == SETITEM:
+            # Only one value can change, so there's no need to compare the whole state.
+            key, value = args
+            old_value = self.state.get(key, _MISSING)
+
+            def is_identical():
+                return old_value == value
+
+        else:
+            is_identical = None
+        with self.mutate_safely(is_identical):
+            response = serializer.dumps(method(*args, **kwargs))
+        self.reply_bytes(response)
 
     def run_fn_atomically(self, request):
         """Execute a function, atomically and reply with the result."""
-        fn = serializer.loads_fn(request[Msgs.info])
+        fn_digest = request[Msgs.info]
+        try:
+            fn = self.fn_cache[fn_digest]
+        except KeyError:
+            try:
+                fn_bytes = request[Msgs.fn]
+            except KeyError:
+                # ask the client to send the function itself.
+                self.reply(FnNotCached)
+                return
+            fn = self.fn_cache[fn_digest] = serializer.loads(fn_bytes)
+            if len(self.fn_cache) > FN_CACHE_SIZE:
+                # evict the least recently used one.
+                self.fn_cache.popitem(last=False)
+        else:
+            self.fn_cache.move_to_end(fn_digest)
         args, kwargs = request[Msgs.args], request[Msgs.kwargs]
         with self.mutate_safely():
-            self.reply(fn(self.state, *args, **kwargs))
+            response = serializer.dumps(fn(self.state, *args, **kwargs))
+        self.reply_bytes(response)
 
-    def recv_request(self):
-        self.identity, request = self.state_router.recv_multipart()
+    def recv_request(self, flags: int = 0):
+        self.identity, request = self.state_router.recv_multipart(flags)
         request = serializer.loads(request)
         try:
             self.namespace = request[Msgs.namespace]
@@ -100,29 +167,52 @@ class StateServer:
 
     def reply(self, response):
         # print("server rep:", self.identity, response, time.time())
-        self.state_router.send_multipart([self.identity, serializer.dumps(response)])
+        self.reply_bytes(serializer.dumps(response))
+
+    def reply_bytes(self, response: bytes):
+        # 2 plain sends; skips the list & loop inside send_multipart().
+        self._send(self.identity, zmq.SNDMORE)
+        self._send(response, copy=False)
 
     @contextmanager
-    def mutate_safely(self):
-        old = deepcopy(self.state)
+    def mutate_safely(self, is_identical: Callable[[], bool] = None):
+        """
+        Roll back the state if the mutation fails,
+        or if the new state can't be pickled. Otherwise, record it in history.
+
+        The reply must be sent only after this exits,
+        so that the client never sees a result for a mutation that was rolled back.
+        """
+        # A pickled snapshot is cheaper than a deepcopy,
+        # and is needed anyway, to store the update in history.
+        old = self.pickled_state()
+        old_len = len(self.state)
         stamp = time.time()
 
         try:
             yield
+            new = serializer.dumps(self.state)
+            if new == old:
+                # Equal pickles mean equal states.
+                # Keep the old bytes, so history & cache share a single copy.
+                new, identical = old, True
+            elif len(self.state) != old_len:
+                identical = False
+            elif is_identical is not None:
+                identical = is_identical()
+            else:
+                # Only unpickle & compare when nothing else can tell
+                # (e.g. same items, different insertion order).
+                identical = self.state == serializer.loads(old)
         except Exception:
-            self.state = self.state_map[self.namespace] = old
+            self.state = self.state_map[self.namespace] = serializer.loads(old)
             raise
 
+        self.pickled_state_map[self.namespace] = new
+
         slot = self.history[self.namespace]
         slot[0].append(stamp)
-        slot[1].append(
-            [
-                self.identity,
-                serializer.dumps((old, self.state, stamp)),
-                self.state == old,
-            ]
-        )
-        self.resolve_pending()
+        slot[1].append([self.identity, old, new, struct.pack("d", stamp), identical])
 
     def resolve_watcher(
         self,
@@ -138,14 +228,17 @@ class StateServer:
         while True:
             index += 1
             try:
-                ident, update, identical = history[index]
+                ident, before, after, stamp, identical = history[index]
             except IndexError:
                 break
             if ident == s_ident:
                 continue
             if identical_not_okay and identical:
                 continue
-            self.watch_router.send_multipart([w_ident, update, bytes(identical)])
+            # the same history frames go out to every watcher; don't copy them each time.
+            self.watch_router.send_multipart(
+                [w_ident, before, after, stamp, bytes(identical)], copy=False
+            )
             return True
 
         return False
@@ -158,27 +251,56 @@ class StateServer:
             if self.resolve_watcher(w_ident, *pending[w_ident]):
                 del pending[w_ident]
 
-    def recv_watcher(self):
+    def recv_watcher(self, flags: int = 0):
         w_ident, s_ident, namespace, identical_okay, only_after = (
-            self.watch_router.recv_multipart()
+            self.watch_router.recv_multipart(flags)
         )
-        self.pending[w_ident] = (
+        watcher = (
             s_ident,
             namespace,
             not identical_okay,
             *struct.unpack("d", only_after),
         )
+        # the history may already have an update for it;
+        # otherwise, it's resolved by a future mutation.
+        if not self.resolve_watcher(w_ident, *watcher):
+            self.pending[w_ident] = watcher
 
     def reset_internal_state(self):
         self.identity = None
         self.namespace = None
         self.state = None
 
-    def tick(self):
-        self.resolve_pending()
+    def recv_all_requests(self):
+        """
+        Serve every request that's already queued up, not just one.
 
-        for sock in zmq.select([self.watch_router, self.state_router], [], [])[0]:
+        Pending watchers are resolved once, after all of them,
+        instead of after every single mutation.
+        """
+        try:
+            self.recv_request()
+            while True:
+                self.reset_internal_state()
+                try:
+                    self.recv_request(zmq.NOBLOCK)
+                except zmq.Again:
+                    break
+        finally:
+            self.resolve_pending()
+
+    def recv_all_watchers(self):
+        """Register every watcher that's already queued up, not just one."""
+        self.recv_watcher()
+        while True:
+            try:
+                self.recv_watcher(zmq.NOBLOCK)
+            except zmq.Again:
+                break
+
+    def tick(self):
+        for sock, _ in self.poller.poll():
             if sock is self.state_router:
-                self.recv_request()
+                self.recv_all_requests()
             elif sock is self.watch_router:
-                self.recv_watcher()
+                self.recv_all_watchers()
@@ -1,9 +1,11 @@
+import hashlib
 import math
 import os
 import struct
 import time
 from collections import deque
-from functools import wraps
+from contextlib import contextmanager
+from functools import wraps, partial
 from pprint import pformat
 from textwrap import indent
 from typing import Hashable, Any, Callable, Dict, Mapping, Sequence
@@ -19,6 +21,7 @@ from zproc.consts import (
     StateUpdate,
     ZMQ_IDENTITY_LENGTH,
     ServerMeta,
+    FnNotCached,
 )
 from zproc.server import tools
 from zproc.state import _type
@@ -28,6 +31,9 @@ class _SkipStateUpdate(Exception):
     pass
 
 
+_MISSING = object()
+
+
 def _dummy_callback(_):
     return _
 
@@ -63,27 +69,31 @@ class StateWatcher:
         if self._only_after is None:
             self._only_after = time.time()
 
+        self._identical_okay_bytes = bytes(self.identical_okay)
+
     def _settimeout(self):
         if time.time() > self._time_limit:
             raise TimeoutError("Timed-out while waiting for a state update.")
 
-        self.state._w_dealer.setsockopt(
-            zmq.RCVTIMEO, int((self._time_limit - time.time()) * 1000)
-        )
+        self.state._set_w_rcvtimeo(int((self._time_limit - time.time()) * 1000))
 
     def _request_reply(self) -> StateUpdate:
         response = util.strict_request_reply(
             [
                 self.state._identity,
                 self.state._namespace_bytes,
-                bytes(self.identical_okay),
+                self._identical_okay_bytes,
                 struct.pack("d", self._only_after),
             ],
             self.state._w_dealer.send_multipart,
-            self.state._w_dealer.recv_multipart,
+            self.state._w_recv_multipart,
         )
+        before, after, stamp, identical = response
         return StateUpdate(
-            *serializer.loads(response[0]), is_identical=bool(response[1])
+            serializer.loads(before),
+            serializer.loads(after),
+            *struct.unpack("d", stamp.bytes),
+            is_identical=bool(identical.bytes),
         )
 
     def go_live(self):
@@ -91,7 +101,7 @@ class StateWatcher:
 
     def __next__(self):
         if self.timeout is None:
-            self.state._w_dealer.setsockopt(zmq.RCVTIMEO, DEFAULT_ZMQ_RECVTIMEO)
+            self.state._set_w_rcvtimeo(DEFAULT_ZMQ_RECVTIMEO)
         else:
             self._time_limit = time.time() + self.timeout
 
@@ -126,6 +136,8 @@ class StateWatcher:
 
 class State(_type.StateDictMethodStub, metaclass=_type.StateType):
     _server_meta: ServerMeta
+    _batch = None
+    _w_rcvtimeo = DEFAULT_ZMQ_RECVTIMEO
 
     def __init__(
         self, server_address: str, *, namespace: str = DEFAULT_NAMESPACE
@@ -159,9 +171,15 @@ class State(_type.StateDictMethodStub, metaclass=_type.StateType):
         self.server_address = server_address
         self.namespace = namespace
 
-        self._zmq_ctx = util.create_zmq_ctx()
+        self._zmq_ctx = util.get_shared_zmq_ctx()
         self._s_dealer = self._create_s_dealer()
+        # bound once, since these are used for every single request.
+        self._s_send = self._s_dealer.send
+        # The reply is unpickled straight out of the zmq buffer, and then the frame is dropped.
+        self._s_recv = partial(self._s_dealer.recv, copy=False)
         self._w_dealer = self._create_w_dealer()
+        # state updates can be large; unpickle them straight out of the zmq buffers.
+        self._w_recv_multipart = partial(self._w_dealer.recv_multipart, copy=False)
 
     def __str__(self):
         return "\n".join(
@@ -247,7 +265,7 @@ class State(_type.StateDictMethodStub, metaclass=_type.StateType):
         request[Msgs.namespace] = self._namespace_bytes
         msg = serializer.dumps(request)
         return serializer.loads(
-            util.strict_request_reply(msg, self._s_dealer.send, self._s_dealer.recv)
+            util.strict_request_reply(msg, self._s_send, self._s_recv)
         )
 
     def set(self, value: dict):
@@ -272,6 +290,42 @@ class State(_type.StateDictMethodStub, metaclass=_type.StateType):
         """
         return self._s_request_reply({Msgs.cmd: Cmds.get_state})
 
+    @contextmanager
+    def batch(self):
+        """
+        Queue up writes to the state, and send them to the server in one go.
+
+        Inside the ``with`` block, calls to
+        ``__setitem__()``, ``__delitem__()``, ``clear()`` and ``update()``
+        are recorded instead of being sent to the server right away.
+
+        On exiting the block, they are applied together, as a single :py:func:`atomic` operation.
+        This saves a round-trip to the server for every write,
+        and state watchers see all of them as a single update.
+
+        If an ``Exception`` occurs inside the block, none of the queued writes are applied.
+
+        .. code-block:: python
+
+            with state.batch():
+                for i in range(100):
+                    state[i] = i * i
+
+        .. note::
+            All other methods are executed immediately,
+            and won't see the queued writes.
+        """
+        assert self._batch is None, "It is not possible to nest `State.batch()` blocks."
+
+        self._batch = []
+        try:
+            yield self
+            ops = self._batch
+        finally:
+            self._batch = None
+        if ops:
+            _run_dict_methods(self, ops)
+
     def keys(self):
         return self.copy().keys()
 
@@ -302,6 +356,12 @@ class State(_type.StateDictMethodStub, metaclass=_type.StateType):
         sock.connect(self._server_meta.watcher_router)
         return sock
 
+    def _set_w_rcvtimeo(self, rcvtimeo: int):
+        # skip the syscall, if the watcher socket already has this timeout.
+        if rcvtimeo != self._w_rcvtimeo:
+            self._w_dealer.setsockopt(zmq.RCVTIMEO, rcvtimeo)
+            self._w_rcvtimeo = rcvtimeo
+
     def when_change_raw(
         self,
         *,
@@ -353,23 +413,24 @@ class State(_type.StateDictMethodStub, metaclass=_type.StateType):
                     "(Hint: Omit `keys`)"
                 )
 
-            key_set = set(keys)
+            key_set = frozenset(keys)
 
             def select(before, after):
-                selected = {*before.keys(), *after.keys()}
                 if exclude:
-                    return selected - key_set
+                    return (before.keys() | after.keys()) - key_set
                 else:
-                    return selected & key_set
+                    # no need to look at the rest of the state
+                    return key_set
 
             def callback(update: StateUpdate) -> dict:
                 before, after = update.before, update.after
-                try:
-                    if not any(before[k] != after[k] for k in select(before, after)):
-                        raise _SkipStateUpdate
-                except KeyError:  # this indirectly implies that something has changed
-                    pass
-                return update.after
+                get_before, get_after = before.get, after.get
+                # a key that's missing on one side compares unequal to the sentinel,
+                # which implies that something has changed.
+                for k in select(before, after):
+                    if get_before(k, _MISSING) != get_after(k, _MISSING):
+                        return after
+                raise _SkipStateUpdate
 
         return StateWatcher(
             state=self,
@@ -514,7 +575,6 @@ class State(_type.StateDictMethodStub, metaclass=_type.StateType):
         try:
             self._s_dealer.close()
             self._w_dealer.close()
-            util.close_zmq_ctx(self._zmq_ctx)
         except Exception:
             pass
 
@@ -559,9 +619,12 @@ def atomic(fn: Callable) -> Callable:
     >>> increment(state)
     1
     """
+    fn_bytes = serializer.dumps_fn(fn)
+    # The server caches functions by this digest,
+    # so the function itself only needs to be sent when the server asks for it.
     msg = {
         Msgs.cmd: Cmds.run_fn_atomically,
-        Msgs.info: serializer.dumps_fn(fn),
+        Msgs.info: hashlib.sha1(fn_bytes).digest(),
         Msgs.args: (),
         Msgs.kwargs: {},
     }
@@ -570,6 +633,16 @@ def atomic(fn: Callable) -> Callable:
     def wrapper(state: State, *args, **kwargs):
         msg[Msgs.args] = args
         msg[Msgs.kwargs] = kwargs
-        return state._s_request_reply(msg)
+        rep = state._s_request_reply(msg)
+        if rep is FnNotCached:
+            rep = state._s_request_reply({**msg, Msgs.fn: fn_bytes})
+        return rep
 
     return wrapper
+
+
+@atomic
+def _run_dict_methods(snapshot: dict, ops: Sequence[bytes]):
+    for op in ops:
+        method_name, args, kwargs = serializer.loads(op)
+        getattr(snapshot, method_name)(*args, **kwargs)
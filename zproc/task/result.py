@@ -8,7 +8,7 @@ class _TaskResultBase:
         #: Passed on from the constructor
         self.task_id = task_id
 
-        self._zmq_ctx = util.create_zmq_ctx()
+        self._zmq_ctx = util.get_shared_zmq_ctx()
         self._server_meta = util.get_server_meta(self._zmq_ctx, server_address)
         self._dealer = self._create_dealer()
 
@@ -26,7 +26,6 @@ class _TaskResultBase:
     def __del__(self):
         try:
             self._dealer.close()
-            util.close_zmq_ctx(self._zmq_ctx)
         except Exception:
             pass
 
@@ -1,5 +1,5 @@
 import multiprocessing
-from collections import defaultdict, Callable, deque
+from collections import defaultdict, Callable
 from typing import Dict, List
 
 import zmq
@@ -10,7 +10,7 @@ from zproc.exceptions import RemoteException
 
 class TaskResultServer:
     result_store: Dict[bytes, Dict[int, bytes]]
-    pending: Dict[bytes, deque]
+    pending: Dict[bytes, List[bytes]]
 
     def __init__(self, router: zmq.Socket, result_pull: zmq.Socket):
         """
@@ -25,8 +25,12 @@ class TaskResultServer:
         self.router = router
         self.result_pull = result_pull
 
+        self.poller = zmq.Poller()
+        self.poller.register(result_pull, zmq.POLLIN)
+        self.poller.register(router, zmq.POLLIN)
+
         self.result_store = defaultdict(dict)
-        self.pending = defaultdict(deque)
+        self.pending = defaultdict(list)
 
     def recv_request(self):
         ident, chunk_id = self.router.recv_multipart()
@@ -37,22 +41,22 @@ class TaskResultServer:
             try:
                 chunk_result = task_store[index]
             except KeyError:
-                self.pending[chunk_id].appendleft(ident)
+                self.pending[chunk_id].append(ident)
             else:
-                self.router.send_multipart([ident, chunk_result])
+                self.router.send_multipart([ident, chunk_result], copy=False)
         except KeyboardInterrupt:
             raise
         except Exception:
             self.router.send_multipart([ident, serializer.dumps(RemoteException())])
 
     def resolve_pending(self, chunk_id: bytes, chunk_result: bytes):
-        pending = self.pending[chunk_id]
+        try:
+            pending = self.pending.pop(chunk_id)
+        except KeyError:
+            return
         send = self.router.send_multipart
-        msg = [None, chunk_result]
-
-        while pending:
-            msg[0] = pending.pop()
-            send(msg)
+        for ident in pending:
+            send([ident, chunk_result], copy=False)
 
     def recv_chunk_result(self):
         chunk_id, chunk_result = self.result_pull.recv_multipart()
@@ -62,7 +66,7 @@ class TaskResultServer:
         # print("stored->", task_id, index)
 
     def tick(self):
-        for sock in zmq.select([self.result_pull, self.router], [], [])[0]:
+        for sock, _ in self.poller.poll():
             if sock is self.router:
                 self.recv_request()
             elif sock is self.result_pull:
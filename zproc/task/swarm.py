@@ -19,7 +19,7 @@ class Swarm:
         #: A ``list`` of :py:class:`multiprocessing.Process` objects for the wokers spawned.
         self.worker_list = []  # type: List[multiprocessing.Process]
 
-        self._zmq_ctx = util.create_zmq_ctx()
+        self._zmq_ctx = util.get_shared_zmq_ctx()
         self._server_meta = util.get_server_meta(self._zmq_ctx, server_address)
         self._task_push = self._zmq_ctx.socket(zmq.PUSH)
         self._task_push.connect(self._server_meta.task_proxy_in)
@@ -41,6 +41,9 @@ class Swarm:
     def count(self, value: int):
         value -= self.count
         if value > 0:
+            # Start all the workers first, and only then wait for them to get ready.
+            # This way, they boot up in parallel.
+            recv_conns = []
             for _ in range(value):
                 recv_conn, send_conn = multiprocessing.Pipe()
 
@@ -48,13 +51,18 @@ class Swarm:
                     target=worker_process, args=[self.server_address, send_conn]
                 )
                 process.start()
+                # tracked right away, so that a failed handshake doesn't lose it.
+                self.worker_list.append(process)
+                recv_conns.append(recv_conn)
 
+            # read every handshake, and only then report the first failure.
+            reps = []
+            for recv_conn in recv_conns:
                 with recv_conn:
-                    rep = recv_conn.recv_bytes()
+                    reps.append(recv_conn.recv_bytes())
+            for rep in reps:
                 if rep:
                     serializer.loads(rep)
-
-                self.worker_list.append(process)
         elif value < 0:
             # Notify remaining workers to finish up, and close shop.
             for _ in range(-value):
@@ -237,7 +245,8 @@ class Swarm:
                     util.encode_chunk_id(task_id, index),
                     target_bytes,
                     serializer.dumps(task),
-                ]
+                ],
+                copy=False,
             )
 
         return SequenceTaskResult(self.server_address, task_id)
@@ -248,6 +257,5 @@ class Swarm:
     def __del__(self):
         try:
             self._task_push.close()
-            util.close_zmq_ctx(self._zmq_ctx)
         except Exception:
             pass
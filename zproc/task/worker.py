@@ -56,6 +56,8 @@ def worker_process(server_address: str, send_conn):
                     raise
                 except Exception:
                     result = RemoteException()
-                result_push.send_multipart([chunk_id, serializer.dumps(result)])
+                result_push.send_multipart(
+                    [chunk_id, serializer.dumps(result)], copy=False
+                )
         except Exception:
             util.log_internal_crash("Worker process")
@@ -1,7 +1,9 @@
+import atexit
 import os
 import pathlib
 import signal
 import struct
+import sys
 import threading
 import time
 import uuid
@@ -10,7 +12,7 @@ from contextlib import suppress, contextmanager, ExitStack
 from itertools import islice
 from textwrap import indent
 from traceback import format_exc
-from typing import Union, Iterable, Generator, Callable, Tuple, Sequence, Optional, Type
+from typing import Union, Iterable, Callable, Tuple, Sequence, Optional, Type, List
 
 import psutil
 import zmq
@@ -61,29 +63,44 @@ def req_server_meta(dealer: zmq.Socket) -> ServerMeta:
     return server_meta
 
 
-def to_catchable_exc(
-    retry_for: Iterable[Union[signal.Signals, Type[BaseException]]]
-) -> Generator[Type[BaseException], None, None]:
+def split_retry_for(
+    retry_for: Optional[Iterable[Union[signal.Signals, Type[BaseException]]]]
+) -> Tuple[Tuple[Type[BaseException], ...], Tuple[signal.Signals, ...]]:
+    """
+    Split ``retry_for`` into the exceptions to catch,
+    and the signals that need to be converted into exceptions (using ``signal_to_exception()``).
+
+    This is done by the parent,
+    so that invalid values are reported right away,
+    and the child has less to do at startup.
+    """
     if retry_for is None:
-        return
+        return (), ()
 
     # catches all signals converted using `signal_to_exception()`
-    yield exceptions.SignalException
+    to_catch: List[Type[BaseException]] = [exceptions.SignalException]
+    signals = []
 
     for e in retry_for:
         if isinstance(e, signal.Signals):
-            exceptions.signal_to_exception(e)
-        elif issubclass(e, BaseException):
-            yield e
+            signals.append(e)
+        elif isinstance(e, type) and issubclass(e, BaseException):
+            to_catch.append(e)
         else:
             raise ValueError(
                 "The items of `retry_for` must either be a sub-class of `BaseException`, "
                 f"or an instance of `signal.Signals`. Not `{e!r}`."
             )
 
+    return tuple(to_catch), tuple(signals)
+
 
 def bind_to_random_ipc(sock: zmq.Socket) -> str:
-    address = "ipc://" + str(IPC_BASE_DIR / str(uuid.uuid1()))
+    if sys.platform.startswith("linux"):
+        # abstract namespace; no socket file to create, or leave behind.
+        address = "ipc://@zproc-" + str(uuid.uuid1())
+    else:
+        address = "ipc://" + str(IPC_BASE_DIR / str(uuid.uuid1()))
     sock.bind(address)
     return address
 
@@ -101,11 +118,6 @@ def bind_to_random_address(sock: zmq.Socket) -> str:
         return bind_to_random_tcp(sock)
 
 
-def close_zmq_ctx(ctx: zmq.Context):
-    ctx.destroy()
-    ctx.term()
-
-
 def clean_process_tree(*signal_handler_args):
     """Stop all Processes in the current Process tree, recursively."""
     parent = psutil.Process()
@@ -129,6 +141,26 @@ def clean_process_tree(*signal_handler_args):
         os._exit(signum)
 
 
+_is_cleanup_registered = False
+
+
+def register_process_tree_cleanup():
+    """
+    Make sure :py:func:`clean_process_tree` runs when the current process exits.
+
+    It's registered with ``atexit`` only once,
+    no matter how many times this is called (e.g. once per Context).
+    """
+    global _is_cleanup_registered
+
+    if not _is_cleanup_registered:
+        atexit.register(clean_process_tree)
+        _is_cleanup_registered = True
+
+    if is_main_thread():
+        signal.signal(signal.SIGTERM, clean_process_tree)
+
+
 def make_chunks(seq: Optional[Sequence], length: int, num_chunks: int):
     if seq is None:
         return [None] * num_chunks
@@ -147,6 +179,33 @@ def create_zmq_ctx(*, linger=False) -> zmq.Context:
     return ctx
 
 
+_shared_zmq_ctx: Optional[zmq.Context] = None
+_shared_zmq_ctx_pid: Optional[int] = None
+_shared_zmq_ctx_lock = threading.Lock()
+
+
+def get_shared_zmq_ctx() -> zmq.Context:
+    """
+    Return a zmq Context, shared by all the client-side objects of the current process.
+
+    A zmq Context runs its own I/O thread,
+    so creating one per object is wasteful.
+
+    Contexts don't survive a fork,
+    so a new one is created when this is called from a child process.
+
+    The shared Context must never be closed by its users; close the sockets instead.
+    """
+    global _shared_zmq_ctx, _shared_zmq_ctx_pid
+
+    with _shared_zmq_ctx_lock:
+        pid = os.getpid()
+        if _shared_zmq_ctx is None or _shared_zmq_ctx_pid != pid:
+            _shared_zmq_ctx = create_zmq_ctx()
+            _shared_zmq_ctx_pid = pid
+        return _shared_zmq_ctx
+
+
 def enclose_in_brackets(s: str) -> str:
     return f"<{s}>"
 